@@ -5,10 +5,13 @@ and measurement in the quantum network simulation.
 """
 
 from functools import partial
+import logging
 import netsquid as ns
 from netsquid.components.qprogram import QuantumProgram
 from netsquid.components.instructions import INSTR_MEASURE
 
+log = logging.getLogger(__name__)
+
 
 def measurement_done(node, q_id, program):
     """Callback executed after qubit measurement completes.
@@ -22,8 +25,25 @@ def measurement_done(node, q_id, program):
     program : QuantumProgram
         The quantum program that executed the measurement
     """
-    result = program.output["m0"][0]
-    print(f"{node.name}(q_id: {q_id}): {result}")
+    if log.isEnabledFor(logging.DEBUG):
+        log.debug("%s(q_id: %s): %s", node.name, q_id, program.output["m0"][0])
+
+
+def _measure_program():
+    """Build a program that measures its first mapped qubit into output "m0"."""
+    program = QuantumProgram()
+    program.apply(INSTR_MEASURE, [0], output_key="m0")
+    return program
+
+
+def _peek_qubit(node, qubit_id):
+    """Get a qubit through the node's quantum memory without removing it."""
+    return node.qnode.qmemory.peek(qubit_id)[0]
+
+
+def _qpm_qubit(node, qubit_id):
+    """Get a qubit from the node's quantum program manager."""
+    return node.qpm.qubits[qubit_id]
 
 
 def create_receive_callback(metrics_collector, qubit_store):
@@ -41,6 +61,12 @@ def create_receive_callback(metrics_collector, qubit_store):
     callable
         Receive callback function that can be used with node.qnp.socket()
     """
+    # Qubit access method per node name, chosen on the node's first delivery
+    qubit_getters = {}
+    # Measurement program per node name; programs keep their output between
+    # runs, so one is not shared across nodes that may measure concurrently
+    measure_programs = {}
+    
     def receive_callback(node, net, deliver_msg):
         """Callback to process received qubits and collect metrics.
         
@@ -59,54 +85,60 @@ def create_receive_callback(metrics_collector, qubit_store):
         deliver_msg : DeliverMessage
             Message containing Bell pair delivery information
         """
-        print(f"{node.name} received Bell Pair: "
-              f"request_id={deliver_msg.request_id}, "
-              f"sequence={deliver_msg.sequence}, "
-              f"bell_qubit_id={deliver_msg.bell_qubit_id}, "
-              f"bell_pair_state={deliver_msg.bell_pair_state}")
+        debug = log.isEnabledFor(logging.DEBUG)
+        if debug:
+            log.debug("%s received Bell Pair: request_id=%s, sequence=%s, "
+                      "bell_qubit_id=%s, bell_pair_state=%s",
+                      node.name, deliver_msg.request_id, deliver_msg.sequence,
+                      deliver_msg.bell_qubit_id, deliver_msg.bell_pair_state)
         
         # Store qubit reference BEFORE measurement
         # Key: (request_id, sequence) uniquely identifies each Bell pair
         key = (deliver_msg.request_id, deliver_msg.sequence)
-        if key not in qubit_store:
-            qubit_store[key] = {}
+        bucket = qubit_store.setdefault(key, {})
         
         try:
             # Get the qubit from quantum memory BEFORE it's measured
-            # Try primary method (qnode.qmemory.peek) first, fallback to qpm.qubits
-            try:
-                qubit = node.qnode.qmemory.peek(deliver_msg.bell_qubit_id)[0]
-            except:
-                qubit = node.qpm.qubits[deliver_msg.bell_qubit_id]
+            # Use qnode.qmemory.peek where available, fallback to qpm.qubits
+            getter = qubit_getters.get(node.name)
+            if getter is None:
+                getter = _peek_qubit if hasattr(node, 'qnode') else _qpm_qubit
+                qubit_getters[node.name] = getter
+            qubit = getter(node, deliver_msg.bell_qubit_id)
                 
-            qubit_store[key][node.name] = qubit
-            print(f"  → Stored qubit for {node.name}, total stored: {len(qubit_store[key])}")
+            bucket[node.name] = qubit
+            if debug:
+                log.debug("  → Stored qubit for %s, total stored: %d",
+                          node.name, len(bucket))
             
             # When both qubits are received, calculate fidelity BEFORE measuring
-            if len(qubit_store[key]) == 2:
-                qubits_list = list(qubit_store[key].values())
-                print(f"  → Both qubits ready, calculating fidelity for pair {deliver_msg.sequence}")
+            if len(bucket) == 2:
+                q1, q2 = bucket.values()
+                if debug:
+                    log.debug("  → Both qubits ready, calculating fidelity for pair %s",
+                              deliver_msg.sequence)
                 
                 # Record delivery with both qubits for fidelity calculation
                 metrics_collector.record_delivery(
                     request_id=deliver_msg.request_id,
                     qubit_id=deliver_msg.bell_qubit_id,
-                    qubits=qubits_list
+                    qubits=(q1, q2)
                 )
+                # The pair is complete; drop it so the store does not grow
+                # for the whole simulation
+                qubit_store.pop(key, None)
                 
-                print(f"  ✓ Recorded metrics for pair {deliver_msg.sequence}")
-                print(f"  ✓ Active requests: {len(metrics_collector._active_requests)}, "
-                      f"Completed: {len(metrics_collector.requests)}")
+                if debug:
+                    log.debug("  ✓ Recorded metrics for pair %s", deliver_msg.sequence)
                       
         except Exception as e:
-            import traceback
-            print(f"  ✗ Error recording metrics: {e}")
-            traceback.print_exc()
+            log.exception("  ✗ Error recording metrics: %s", e)
         
         # NOW measure the qubit (after fidelity calculation)
         # Measurement collapses the quantum state, so it must happen last
-        measure = QuantumProgram()
-        measure.apply(INSTR_MEASURE, [0], output_key="m0")
+        measure = measure_programs.get(node.name)
+        if measure is None:
+            measure = measure_programs[node.name] = _measure_program()
         
         node.qpm.execute_program(
             partial(measurement_done, node, deliver_msg.bell_qubit_id, measure),
@@ -6,17 +6,74 @@ Request Latency (Lr), Unit Latency (Lu), Scaled Latency (Ls), Fairness (J),
 and Robustness (RM).
 """
 
-import json
+import logging
 import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from operator import itemgetter
+from pathlib import Path
+
+import numpy as np
+import orjson
 
 from metrics.fairness import fairness
 from metrics.robustness import robustness
-from demo_metrics.demo_simulation import run_single_simulation
+from demo_metrics.demo_simulation import (
+    FIDELITY_FILE, prepare_fidelity_map, run_single_simulation,
+)
+
+
+def _run_seeded(source, dest, seed, num_bps, config_file):
+    """Run one simulation with its seed; module level so workers can unpickle it."""
+    return run_single_simulation(source, dest, num_bps=num_bps,
+                                 config_file=config_file, seed=seed)
+
+
+def _run_parallel(sources, dests, num_bps, config_file, label="", base_seed=0):
+    """Run independent simulations in a process pool.
+    
+    Parameters
+    ----------
+    sources : list of str
+        Source node name for each simulation
+    dests : list of str
+        Destination node name for each simulation
+    num_bps : int
+        Number of Bell pairs per request
+    config_file : str
+        Path to network configuration YAML file
+    label : str, optional
+        Suffix appended to the progress output (e.g. " (degraded)")
+    base_seed : int, optional
+        Seed of the first simulation; simulation i is seeded with
+        ``base_seed + i``, so results do not depend on which worker runs it
+        
+    Returns
+    -------
+    list
+        Metrics dictionaries in the same order as ``sources``/``dests``
+    """
+    # Set up shared inputs once, before the workers start
+    prepare_fidelity_map(config_file, FIDELITY_FILE)
+    
+    # Bind the arguments shared by every run of this scenario
+    runner = partial(_run_seeded, num_bps=num_bps, config_file=config_file)
+    
+    results = []
+    seeds = range(base_seed, base_seed + len(sources))
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        # map (rather than as_completed) keeps results in submission order
+        for source, dest, metrics in zip(sources, dests, executor.map(runner, sources, dests, seeds)):
+            results.append(metrics)
+            print(f"[{len(results)}/{len(sources)}] {source} → {dest}{label}")
+    return results
 
 
 def run_baseline_simulations(num_requests=5, num_bps=2):
     """Run baseline simulations with normal network operation.
     
+    The simulations are independent and run in parallel across processes.
+    
     Parameters
     ----------
     num_requests : int
@@ -29,26 +86,21 @@ def run_baseline_simulations(num_requests=5, num_bps=2):
     tuple
         (all_metrics_ra, all_metrics_rb) - Lists of metrics dictionaries
     """
-    all_metrics_ra = []
-    all_metrics_rb = []
-    
     print("="*60)
     print("BASELINE SIMULATIONS (Normal Operation)")
     print("="*60)
     
-    # Run simulations for RA → RB
+    # Run simulations for RA → RB and RB → RA
     print(f"\nRunning {num_requests} simulations: RA → RB ({num_bps} Bell pairs each)")
-    for i in range(num_requests):
-        print(f"[{i+1}/{num_requests}] RA → RB")
-        metrics = run_single_simulation("RA", "RB", num_bps=num_bps, config_file="./demo_metrics/config.yml")
-        all_metrics_ra.append(metrics)
-    
-    # Run simulations for RB → RA
-    print(f"\nRunning {num_requests} simulations: RB → RA ({num_bps} Bell pairs each)")
-    for i in range(num_requests):
-        print(f"[{i+1}/{num_requests}] RB → RA")
-        metrics = run_single_simulation("RB", "RA", num_bps=num_bps, config_file="./demo_metrics/config.yml")
-        all_metrics_rb.append(metrics)
+    print(f"Running {num_requests} simulations: RB → RA ({num_bps} Bell pairs each)")
+    results = _run_parallel(
+        ["RA"] * num_requests + ["RB"] * num_requests,
+        ["RB"] * num_requests + ["RA"] * num_requests,
+        num_bps,
+        "./demo_metrics/config.yml",
+    )
+    all_metrics_ra = results[:num_requests]
+    all_metrics_rb = results[num_requests:]
     
     return all_metrics_ra, all_metrics_rb
 
@@ -56,6 +108,8 @@ def run_baseline_simulations(num_requests=5, num_bps=2):
 def run_degraded_simulations(num_degraded=5, num_bps=2):
     """Run degraded simulations with link degradation.
     
+    The simulations are independent and run in parallel across processes.
+    
     Parameters
     ----------
     num_degraded : int
@@ -68,9 +122,6 @@ def run_degraded_simulations(num_degraded=5, num_bps=2):
     tuple
         (all_metrics_ra_degraded, all_metrics_rb_degraded) - Lists of metrics dictionaries
     """
-    all_metrics_ra_degraded = []
-    all_metrics_rb_degraded = []
-    
     print("\n\n" + "="*60)
     print("DEGRADED SIMULATIONS (Link Degradation)")
     print("="*60)
@@ -79,23 +130,84 @@ def run_degraded_simulations(num_degraded=5, num_bps=2):
     print("  - This reduces available entanglement paths")
     print("  - Simulates link degradation/partial failures")
     
-    # Run degraded simulations for RA → RB
+    # Run degraded simulations for RA → RB and RB → RA
     print(f"\nRunning {num_degraded} degraded simulations: RA → RB")
-    for i in range(num_degraded):
-        print(f"[{i+1}/{num_degraded}] RA → RB (degraded)")
-        metrics = run_single_simulation("RA", "RB", num_bps=num_bps, config_file="./demo_metrics/config_degraded.yml")
-        all_metrics_ra_degraded.append(metrics)
-    
-    # Run degraded simulations for RB → RA
-    print(f"\nRunning {num_degraded} degraded simulations: RB → RA")
-    for i in range(num_degraded):
-        print(f"[{i+1}/{num_degraded}] RB → RA (degraded)")
-        metrics = run_single_simulation("RB", "RA", num_bps=num_bps, config_file="./demo_metrics/config_degraded.yml")
-        all_metrics_rb_degraded.append(metrics)
+    print(f"Running {num_degraded} degraded simulations: RB → RA")
+    results = _run_parallel(
+        ["RA"] * num_degraded + ["RB"] * num_degraded,
+        ["RB"] * num_degraded + ["RA"] * num_degraded,
+        num_bps,
+        "./demo_metrics/config_degraded.yml",
+        label=" (degraded)",
+    )
+    all_metrics_ra_degraded = results[:num_degraded]
+    all_metrics_rb_degraded = results[num_degraded:]
     
     return all_metrics_ra_degraded, all_metrics_rb_degraded
 
 
+# Per-simulation metric key for each per-node array in the combined metrics
+_COMBINED_FIELDS = {
+    'throughputs': 'throughput',
+    'latencies': 'mean_request_latency',
+    'unit_latencies': 'mean_unit_latency',
+    'scaled_latencies': 'mean_scaled_latency',
+    'fidelities': 'mean_fidelity',
+}
+_get_combined_fields = itemgetter(*_COMBINED_FIELDS.values())
+# Key of each per-node array's mean in the saved averages
+_AVERAGE_KEYS = {
+    'throughputs': 'throughput',
+    'latencies': 'latency',
+    'unit_latencies': 'unit_latency',
+    'scaled_latencies': 'scaled_latency',
+    'fidelities': 'fidelity',
+}
+
+
+def _to_arrays(all_metrics):
+    """Convert a list of per-simulation metrics into one array per metric.
+    
+    Parameters
+    ----------
+    all_metrics : list
+        List of metrics dictionaries from one node's simulations
+        
+    Returns
+    -------
+    dict
+        Mapping of field name (see ``_COMBINED_FIELDS``) to a float64 array
+    """
+    # One pass over the dicts; transpose so each field is a contiguous row
+    rows = np.array(list(map(_get_combined_fields, all_metrics)), dtype=np.float64)
+    columns = rows.reshape(-1, len(_COMBINED_FIELDS)).T.copy()
+    return dict(zip(_COMBINED_FIELDS, columns))
+
+
+def _summarize(arrays):
+    """Compute mean, min and max of each per-node array.
+    
+    Parameters
+    ----------
+    arrays : dict
+        Per-node arrays as returned by ``_to_arrays``
+        
+    Returns
+    -------
+    dict
+        Mapping of average key (see ``_AVERAGE_KEYS``) to a dict with
+        'mean', 'min' and 'max'
+    """
+    return {
+        _AVERAGE_KEYS[field]: {
+            'mean': float(arr.mean()),
+            'min': float(arr.min()),
+            'max': float(arr.max()),
+        }
+        for field, arr in arrays.items()
+    }
+
+
 def calculate_combined_metrics(all_metrics_ra, all_metrics_rb):
     """Calculate combined metrics across all simulations.
     
@@ -110,42 +222,23 @@ def calculate_combined_metrics(all_metrics_ra, all_metrics_rb):
     -------
     dict
         Dictionary containing:
-        - node_throughputs, node_latencies, node_fidelities (lists)
+        - node_throughputs, node_latencies, node_fidelities (arrays)
         - fairness metrics (J_throughput, J_latency, J_fidelity)
-        - per-node averages (ra_throughputs, ra_latencies, etc.)
+        - per-node arrays (ra_throughputs, ra_latencies, etc.)
+        - per-node mean/min/max (ra_stats, rb_stats), keyed as saved to JSON
+        - per-node means (ra_averages, rb_averages), keyed as saved to JSON
+        - means over both nodes (combined_throughput_mean, combined_latency_mean,
+          combined_fidelity_mean)
     """
     # Extract per-node data from all simulations
-    ra_node_throughputs = []
-    ra_node_latencies = []
-    ra_node_unit_latencies = []
-    ra_node_scaled_latencies = []
-    ra_node_fidelities = []
-
-    rb_node_throughputs = []
-    rb_node_latencies = []
-    rb_node_unit_latencies = []
-    rb_node_scaled_latencies = []
-    rb_node_fidelities = []
-    
-    # Extract from RA simulations
-    for metrics in all_metrics_ra:
-        ra_node_throughputs.append(metrics['throughput'])
-        ra_node_latencies.append(metrics['mean_request_latency'])
-        ra_node_unit_latencies.append(metrics['mean_unit_latency'])
-        ra_node_scaled_latencies.append(metrics['mean_scaled_latency'])
-        ra_node_fidelities.append(metrics['mean_fidelity'])
-            
-    # Extract from RB simulations
-    for metrics in all_metrics_rb:
-        rb_node_throughputs.append(metrics['throughput'])
-        rb_node_latencies.append(metrics['mean_request_latency'])
-        rb_node_unit_latencies.append(metrics['mean_unit_latency'])
-        rb_node_scaled_latencies.append(metrics['mean_scaled_latency'])
-        rb_node_fidelities.append(metrics['mean_fidelity'])
-    
-    node_throughputs = ra_node_throughputs + rb_node_throughputs
-    node_latencies = ra_node_latencies + rb_node_latencies
-    node_fidelities = ra_node_fidelities + rb_node_fidelities
+    ra = _to_arrays(all_metrics_ra)
+    rb = _to_arrays(all_metrics_rb)
+    ra_stats = _summarize(ra)
+    rb_stats = _summarize(rb)
+    
+    node_throughputs = np.concatenate([ra['throughputs'], rb['throughputs']])
+    node_latencies = np.concatenate([ra['latencies'], rb['latencies']])
+    node_fidelities = np.concatenate([ra['fidelities'], rb['fidelities']])
 
     # Calculate fairness metrics across all runs
     J_throughput = fairness(node_throughputs) if len(node_throughputs) > 1 else 1.0
@@ -160,16 +253,40 @@ def calculate_combined_metrics(all_metrics_ra, all_metrics_rb):
         'J_throughput': J_throughput,
         'J_latency': J_latency,
         'J_fidelity': J_fidelity,
-        'ra_throughputs': ra_node_throughputs,
-        'ra_latencies': ra_node_latencies,
-        'ra_unit_latencies': ra_node_unit_latencies,
-        'ra_scaled_latencies': ra_node_scaled_latencies,
-        'ra_fidelities': ra_node_fidelities,
-        'rb_throughputs': rb_node_throughputs,
-        'rb_latencies': rb_node_latencies,
-        'rb_unit_latencies': rb_node_unit_latencies,
-        'rb_scaled_latencies': rb_node_scaled_latencies,
-        'rb_fidelities': rb_node_fidelities,
+        **{f'ra_{field}': arr for field, arr in ra.items()},
+        **{f'rb_{field}': arr for field, arr in rb.items()},
+        'ra_stats': ra_stats,
+        'rb_stats': rb_stats,
+        'ra_averages': {key: stats['mean'] for key, stats in ra_stats.items()},
+        'rb_averages': {key: stats['mean'] for key, stats in rb_stats.items()},
+        'combined_throughput_mean': float(node_throughputs.mean()),
+        'combined_latency_mean': float(node_latencies.mean()),
+        'combined_fidelity_mean': float(node_fidelities.mean()),
+    }
+
+
+def compute_robustness(combined_baseline, combined_degraded):
+    """Calculate robustness of the combined metrics under degradation.
+    
+    Parameters
+    ----------
+    combined_baseline : dict
+        Combined metrics from baseline simulations
+    combined_degraded : dict
+        Combined metrics from degraded simulations
+        
+    Returns
+    -------
+    dict
+        RM_throughput, RM_latency and RM_fidelity
+    """
+    return {
+        'RM_throughput': robustness(combined_baseline['combined_throughput_mean'],
+                                    combined_degraded['combined_throughput_mean'], 'throughput'),
+        'RM_latency': robustness(combined_baseline['combined_latency_mean'],
+                                 combined_degraded['combined_latency_mean'], 'latency'),
+        'RM_fidelity': robustness(combined_baseline['combined_fidelity_mean'],
+                                  combined_degraded['combined_fidelity_mean'], 'fidelity'),
     }
 
 
@@ -190,40 +307,31 @@ def print_results(num_requests, combined_baseline, combined_degraded=None):
     print("="*60)
     
     # Print per-node statistics
-    ra_throughputs = combined_baseline['ra_throughputs']
-    ra_latencies = combined_baseline['ra_latencies']
-    ra_unit_latencies = combined_baseline['ra_unit_latencies']
-    ra_scaled_latencies = combined_baseline['ra_scaled_latencies']
-    ra_fidelities = combined_baseline['ra_fidelities']
-    
-    rb_throughputs = combined_baseline['rb_throughputs']
-    rb_latencies = combined_baseline['rb_latencies']
-    rb_unit_latencies = combined_baseline['rb_unit_latencies']
-    rb_scaled_latencies = combined_baseline['rb_scaled_latencies']
-    rb_fidelities = combined_baseline['rb_fidelities']
+    ra_stats = combined_baseline['ra_stats']
+    rb_stats = combined_baseline['rb_stats']
     
     print(f"\nRA Statistics ({num_requests} requests):")
-    print(f"  Avg Throughput: {sum(ra_throughputs)/len(ra_throughputs):.2f} states/s "
-          f"(min: {min(ra_throughputs):.2f}, max: {max(ra_throughputs):.2f})")
-    print(f"  Avg Latency: {sum(ra_latencies)/len(ra_latencies)/1e6:.2f} ms "
-          f"(min: {min(ra_latencies)/1e6:.2f}, max: {max(ra_latencies)/1e6:.2f})")
-    print(f"  Avg Fidelity: {sum(ra_fidelities)/len(ra_fidelities):.6f} "
-          f"(min: {min(ra_fidelities):.6f}, max: {max(ra_fidelities):.6f})")
-    print(f"  Avg Unit Latency: {sum(ra_unit_latencies)/len(ra_unit_latencies)/1e6:.2f} ms "
-          f"(min: {min(ra_unit_latencies)/1e6:.2f}, max: {max(ra_unit_latencies)/1e6:.2f})")
-    print(f"  Avg Scaled Latency: {sum(ra_scaled_latencies)/len(ra_scaled_latencies)/1e6:.2f} ms "
-          f"(min: {min(ra_scaled_latencies)/1e6:.2f}, max: {max(ra_scaled_latencies)/1e6:.2f})")
+    print(f"  Avg Throughput: {ra_stats['throughput']['mean']:.2f} states/s "
+          f"(min: {ra_stats['throughput']['min']:.2f}, max: {ra_stats['throughput']['max']:.2f})")
+    print(f"  Avg Latency: {ra_stats['latency']['mean']/1e6:.2f} ms "
+          f"(min: {ra_stats['latency']['min']/1e6:.2f}, max: {ra_stats['latency']['max']/1e6:.2f})")
+    print(f"  Avg Fidelity: {ra_stats['fidelity']['mean']:.6f} "
+          f"(min: {ra_stats['fidelity']['min']:.6f}, max: {ra_stats['fidelity']['max']:.6f})")
+    print(f"  Avg Unit Latency: {ra_stats['unit_latency']['mean']/1e6:.2f} ms "
+          f"(min: {ra_stats['unit_latency']['min']/1e6:.2f}, max: {ra_stats['unit_latency']['max']/1e6:.2f})")
+    print(f"  Avg Scaled Latency: {ra_stats['scaled_latency']['mean']/1e6:.2f} ms "
+          f"(min: {ra_stats['scaled_latency']['min']/1e6:.2f}, max: {ra_stats['scaled_latency']['max']/1e6:.2f})")
     print(f"\nRB Statistics ({num_requests} requests):")
-    print(f"  Avg Throughput: {sum(rb_throughputs)/len(rb_throughputs):.2f} states/s "
-          f"(min: {min(rb_throughputs):.2f}, max: {max(rb_throughputs):.2f})")
-    print(f"  Avg Latency: {sum(rb_latencies)/len(rb_latencies)/1e6:.2f} ms "
-          f"(min: {min(rb_latencies)/1e6:.2f}, max: {max(rb_latencies)/1e6:.2f})")
-    print(f"  Avg Fidelity: {sum(rb_fidelities)/len(rb_fidelities):.6f} "
-          f"(min: {min(rb_fidelities):.6f}, max: {max(rb_fidelities):.6f})")
-    print(f"  Avg Unit Latency: {sum(rb_unit_latencies)/len(rb_unit_latencies)/1e6:.2f} ms "
-          f"(min: {min(rb_unit_latencies)/1e6:.2f}, max: {max(rb_unit_latencies)/1e6:.2f})")
-    print(f"  Avg Scaled Latency: {sum(rb_scaled_latencies)/len(rb_scaled_latencies)/1e6:.2f} ms "
-          f"(min: {min(rb_scaled_latencies)/1e6:.2f}, max: {max(rb_scaled_latencies)/1e6:.2f})")
+    print(f"  Avg Throughput: {rb_stats['throughput']['mean']:.2f} states/s "
+          f"(min: {rb_stats['throughput']['min']:.2f}, max: {rb_stats['throughput']['max']:.2f})")
+    print(f"  Avg Latency: {rb_stats['latency']['mean']/1e6:.2f} ms "
+          f"(min: {rb_stats['latency']['min']/1e6:.2f}, max: {rb_stats['latency']['max']/1e6:.2f})")
+    print(f"  Avg Fidelity: {rb_stats['fidelity']['mean']:.6f} "
+          f"(min: {rb_stats['fidelity']['min']:.6f}, max: {rb_stats['fidelity']['max']:.6f})")
+    print(f"  Avg Unit Latency: {rb_stats['unit_latency']['mean']/1e6:.2f} ms "
+          f"(min: {rb_stats['unit_latency']['min']/1e6:.2f}, max: {rb_stats['unit_latency']['max']/1e6:.2f})")
+    print(f"  Avg Scaled Latency: {rb_stats['scaled_latency']['mean']/1e6:.2f} ms "
+          f"(min: {rb_stats['scaled_latency']['min']/1e6:.2f}, max: {rb_stats['scaled_latency']['max']/1e6:.2f})")
     print(f"\nFairness Metrics (Jain's Index, comparing all {num_requests} RA vs {num_requests} RB requests):")
     print(f"  J_throughput: {combined_baseline['J_throughput']:.6f}")
     print(f"  J_latency: {combined_baseline['J_latency']:.6f}")
@@ -231,41 +339,23 @@ def print_results(num_requests, combined_baseline, combined_degraded=None):
     
     # Print robustness metrics if degraded results available
     if combined_degraded is not None:
-        baseline_throughput = (sum(ra_throughputs) + sum(rb_throughputs)) / (len(ra_throughputs) + len(rb_throughputs))
-        baseline_latency = (sum(ra_latencies) + sum(rb_latencies)) / (len(ra_latencies) + len(rb_latencies))
-        baseline_fidelity = (sum(ra_fidelities) + sum(rb_fidelities)) / (len(ra_fidelities) + len(rb_fidelities))
-        
-        ra_throughputs_deg = combined_degraded['ra_throughputs']
-        ra_latencies_deg = combined_degraded['ra_latencies']
-        ra_unit_latencies_deg = combined_degraded['ra_unit_latencies']
-        ra_scaled_latencies_deg = combined_degraded['ra_scaled_latencies']
-        ra_fidelities_deg = combined_degraded['ra_fidelities']
-        rb_throughputs_deg = combined_degraded['rb_throughputs']
-        rb_latencies_deg = combined_degraded['rb_latencies']
-        rb_unit_latencies_deg = combined_degraded['rb_unit_latencies']
-        rb_scaled_latencies_deg = combined_degraded['rb_scaled_latencies']
-        rb_fidelities_deg = combined_degraded['rb_fidelities']
-        
-        degraded_throughput = (sum(ra_throughputs_deg) + sum(rb_throughputs_deg)) / (len(ra_throughputs_deg) + len(rb_throughputs_deg))
-        degraded_latency = (sum(ra_latencies_deg) + sum(rb_latencies_deg)) / (len(ra_latencies_deg) + len(rb_latencies_deg))
-        degraded_fidelity = (sum(ra_fidelities_deg) + sum(rb_fidelities_deg)) / (len(ra_fidelities_deg) + len(rb_fidelities_deg))
-        
-        RM_throughput = robustness(baseline_throughput, degraded_throughput, 'throughput')
-        RM_latency = robustness(baseline_latency, degraded_latency, 'latency')
-        RM_fidelity = robustness(baseline_fidelity, degraded_fidelity, 'fidelity')
+        rm = compute_robustness(combined_baseline, combined_degraded)
+        RM_throughput = rm['RM_throughput']
+        RM_latency = rm['RM_latency']
+        RM_fidelity = rm['RM_fidelity']
         
         print("\n\n" + "="*60)
         print("ROBUSTNESS METRICS (RM)")
         print("="*60)
         print("\nBaseline (Normal Operation, alpha=[0.03, 0.1, 0.3]):")
-        print(f"  Throughput: {baseline_throughput:.2f} states/s")
-        print(f"  Latency: {baseline_latency/1e6:.2f} ms")
-        print(f"  Fidelity: {baseline_fidelity:.6f}")
+        print(f"  Throughput: {combined_baseline['combined_throughput_mean']:.2f} states/s")
+        print(f"  Latency: {combined_baseline['combined_latency_mean']/1e6:.2f} ms")
+        print(f"  Fidelity: {combined_baseline['combined_fidelity_mean']:.6f}")
         
         print("\nDegraded (Link Degradation, alpha=[0.1, 0.3, 0.5]):")
-        print(f"  Throughput: {degraded_throughput:.2f} states/s")
-        print(f"  Latency: {degraded_latency/1e6:.2f} ms")
-        print(f"  Fidelity: {degraded_fidelity:.6f}")
+        print(f"  Throughput: {combined_degraded['combined_throughput_mean']:.2f} states/s")
+        print(f"  Latency: {combined_degraded['combined_latency_mean']/1e6:.2f} ms")
+        print(f"  Fidelity: {combined_degraded['combined_fidelity_mean']:.6f}")
         
         print("\nRobustness (RM = degraded/baseline, closer to 1.0 is more robust):")
         print(f"  RM_throughput: {RM_throughput:.6f} ({(1-RM_throughput)*100:.1f}% degradation)")
@@ -297,11 +387,10 @@ def save_results(num_requests, num_bps, all_metrics_ra, all_metrics_rb,
     combined_degraded : dict, optional
         Combined degraded metrics
     """
-    results_dir = "./demo_metrics/results"
-    if not os.path.exists(results_dir):
-        os.makedirs(results_dir)
+    results_dir = Path("./demo_metrics/results")
+    results_dir.mkdir(parents=True, exist_ok=True)
         
-    results_file = os.path.join(results_dir, "results.json")
+    results_file = results_dir / "results.json"
     
     result_data = {
         "scenario": "multiple_simulations_with_metrics",
@@ -310,20 +399,8 @@ def save_results(num_requests, num_bps, all_metrics_ra, all_metrics_rb,
         "baseline": {
             "ra_simulations": all_metrics_ra,
             "rb_simulations": all_metrics_rb,
-            "ra_averages": {
-                "throughput": sum(combined_baseline['ra_throughputs'])/len(combined_baseline['ra_throughputs']),
-                "latency": sum(combined_baseline['ra_latencies'])/len(combined_baseline['ra_latencies']),
-                "unit_latency": sum(combined_baseline['ra_unit_latencies'])/len(combined_baseline['ra_unit_latencies']),
-                "scaled_latency": sum(combined_baseline['ra_scaled_latencies'])/len(combined_baseline['ra_scaled_latencies']),
-                "fidelity": sum(combined_baseline['ra_fidelities'])/len(combined_baseline['ra_fidelities']),
-            },
-            "rb_averages": {
-                "throughput": sum(combined_baseline['rb_throughputs'])/len(combined_baseline['rb_throughputs']),
-                "latency": sum(combined_baseline['rb_latencies'])/len(combined_baseline['rb_latencies']),
-                "unit_latency": sum(combined_baseline['rb_unit_latencies'])/len(combined_baseline['rb_unit_latencies']),
-                "scaled_latency": sum(combined_baseline['rb_scaled_latencies'])/len(combined_baseline['rb_scaled_latencies']),
-                "fidelity": sum(combined_baseline['rb_fidelities'])/len(combined_baseline['rb_fidelities']),
-            },
+            "ra_averages": combined_baseline['ra_averages'],
+            "rb_averages": combined_baseline['rb_averages'],
             "combined_fairness": {
                 "J_throughput": combined_baseline['J_throughput'],
                 "J_latency": combined_baseline['J_latency'],
@@ -335,74 +412,39 @@ def save_results(num_requests, num_bps, all_metrics_ra, all_metrics_rb,
     
     # Add robustness data if available
     if combined_degraded is not None and all_metrics_ra_degraded is not None:
-        ra_throughputs = combined_baseline['ra_throughputs']
-        ra_latencies = combined_baseline['ra_latencies']
-        ra_unit_latencies = combined_baseline['ra_unit_latencies']
-        ra_scaled_latencies = combined_baseline['ra_scaled_latencies']
-        ra_fidelities = combined_baseline['ra_fidelities']
-        rb_throughputs = combined_baseline['rb_throughputs']
-        rb_latencies = combined_baseline['rb_latencies']
-        rb_unit_latencies = combined_baseline['rb_unit_latencies']
-        rb_scaled_latencies = combined_baseline['rb_scaled_latencies']
-        rb_fidelities = combined_baseline['rb_fidelities']
-        
-        baseline_throughput = (sum(ra_throughputs) + sum(rb_throughputs)) / (len(ra_throughputs) + len(rb_throughputs))
-        baseline_latency = (sum(ra_latencies) + sum(rb_latencies)) / (len(ra_latencies) + len(rb_latencies))
-        baseline_fidelity = (sum(ra_fidelities) + sum(rb_fidelities)) / (len(ra_fidelities) + len(rb_fidelities))
-        
-        ra_throughputs_deg = combined_degraded['ra_throughputs']
-        ra_latencies_deg = combined_degraded['ra_latencies']
-        ra_unit_latencies_deg = combined_degraded['ra_unit_latencies']
-        ra_scaled_latencies_deg = combined_degraded['ra_scaled_latencies']
-        ra_fidelities_deg = combined_degraded['ra_fidelities']
-        rb_throughputs_deg = combined_degraded['rb_throughputs']
-        rb_latencies_deg = combined_degraded['rb_latencies']
-        rb_unit_latencies_deg = combined_degraded['rb_unit_latencies']
-        rb_scaled_latencies_deg = combined_degraded['rb_scaled_latencies']
-        rb_fidelities_deg = combined_degraded['rb_fidelities']
-        
-        degraded_throughput = (sum(ra_throughputs_deg) + sum(rb_throughputs_deg)) / (len(ra_throughputs_deg) + len(rb_throughputs_deg))
-        degraded_latency = (sum(ra_latencies_deg) + sum(rb_latencies_deg)) / (len(ra_latencies_deg) + len(rb_latencies_deg))
-        degraded_fidelity = (sum(ra_fidelities_deg) + sum(rb_fidelities_deg)) / (len(ra_fidelities_deg) + len(rb_fidelities_deg))
-        
         result_data["degraded"] = {
             "ra_simulations": all_metrics_ra_degraded,
             "rb_simulations": all_metrics_rb_degraded,
-            "ra_averages": {
-                "throughput": sum(combined_degraded['ra_throughputs'])/len(combined_degraded['ra_throughputs']),
-                "latency": sum(combined_degraded['ra_latencies'])/len(combined_degraded['ra_latencies']),
-                "unit_latency": sum(combined_degraded['ra_unit_latencies'])/len(combined_degraded['ra_unit_latencies']),
-                "scaled_latency": sum(combined_degraded['ra_scaled_latencies'])/len(combined_degraded['ra_scaled_latencies']),
-                "fidelity": sum(combined_degraded['ra_fidelities'])/len(combined_degraded['ra_fidelities']),
-            },
-            "rb_averages": {
-                "throughput": sum(combined_degraded['rb_throughputs'])/len(combined_degraded['rb_throughputs']),
-                "latency": sum(combined_degraded['rb_latencies'])/len(combined_degraded['rb_latencies']),
-                "unit_latency": sum(combined_degraded['rb_unit_latencies'])/len(combined_degraded['rb_unit_latencies']),
-                "scaled_latency": sum(combined_degraded['rb_scaled_latencies'])/len(combined_degraded['rb_scaled_latencies']),
-                "fidelity": sum(combined_degraded['rb_fidelities'])/len(combined_degraded['rb_fidelities']),
-            },
+            "ra_averages": combined_degraded['ra_averages'],
+            "rb_averages": combined_degraded['rb_averages'],
             "fairness": {
                 "J_throughput": combined_degraded['J_throughput'],
                 "J_latency": combined_degraded['J_latency'],
                 "J_fidelity": combined_degraded['J_fidelity'],
             }
         }
-        result_data["robustness"] = {
-            "RM_throughput": robustness(baseline_throughput, degraded_throughput, 'throughput'),
-            "RM_latency": robustness(baseline_latency, degraded_latency, 'latency'),
-            "RM_fidelity": robustness(baseline_fidelity, degraded_fidelity, 'fidelity'),
-        }
+        result_data["robustness"] = compute_robustness(combined_baseline, combined_degraded)
     
-    with open(results_file, "w") as f:
-        json.dump(result_data, f, indent=4, default=str)
+    # orjson serializes NumPy scalars/arrays natively; anything else falls back to str
+    options = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+    results_file.write_bytes(orjson.dumps(result_data, default=str, option=options))
     
     print(f"\n✓ Metrics saved to: {results_file}")
+    
+    # Set PRETTY=1 to also write an indented copy for reading
+    if os.environ.get("PRETTY") == "1":
+        pretty_file = results_dir / "results_pretty.json"
+        pretty_file.write_bytes(orjson.dumps(
+            result_data, default=str, option=options | orjson.OPT_INDENT_2))
+        print(f"✓ Indented copy saved to: {pretty_file}")
     print("="*60 + "\n")
 
 
 def main():
     """Main entry point for the quantum network metrics demo."""
+    # Per-Bell-pair callback output is logged at DEBUG; lower the level to see it
+    logging.basicConfig(level=logging.WARNING)
+    
     # Configuration
     num_requests = 5  # Number of baseline simulations per node
     num_bps = 2       # Bell pairs per request
@@ -4,7 +4,8 @@ This module provides functions to run individual simulations and
 configure the quantum network with different parameters.
 """
 
-from functools import partial
+from copy import deepcopy
+from functools import lru_cache, partial
 import os
 
 import netsquid as ns
@@ -17,8 +18,52 @@ from metrics.metrics_collector import MetricsCollector
 from demo_metrics.demo_callbacks import create_receive_callback
 
 
+FIDELITY_FILE = "./demo_metrics/fidelities.json"
+
+
+@lru_cache(maxsize=None)
+def prepare_fidelity_map(config_file, fidelity_file=FIDELITY_FILE):
+    """Calculate the fidelity map for a network configuration if it is missing.
+    
+    The check runs once per process and file pair; call it before starting
+    worker processes so they do not all try to create the file.
+    
+    Parameters
+    ----------
+    config_file : str
+        Path to network configuration YAML file
+    fidelity_file : str, optional
+        Path of the fidelity map JSON file
+    """
+    if not os.path.exists(fidelity_file):
+        calculate_fidelity_map(config_file, fidelity_file)
+
+
+@lru_cache(maxsize=4)
+def _load_fidelity_map_cached(path, mtime):
+    """Parse a fidelity map file; mtime is only part of the cache key."""
+    return load_fidelity_map(path)
+
+
+def get_fidelity_map(fidelity_file=FIDELITY_FILE):
+    """Return the parsed fidelity map, reusing it while the file is unchanged.
+    
+    The map is cached per absolute path and modification time, so repeated
+    simulations in one process parse the JSON file only once. Each caller
+    gets its own copy, so changes made to it by one simulation do not leak
+    into the next.
+    
+    Parameters
+    ----------
+    fidelity_file : str, optional
+        Path of the fidelity map JSON file
+    """
+    path = os.path.abspath(fidelity_file)
+    return deepcopy(_load_fidelity_map_cached(path, os.path.getmtime(path)))
+
+
 def run_single_simulation(source_node, dest_node, num_bps=2, 
-                         config_file="./demo_metrics/config.yml"):
+                         config_file="./demo_metrics/config.yml", seed=None):
     """Run a single quantum network simulation with one request.
     
     Parameters
@@ -31,6 +76,9 @@ def run_single_simulation(source_node, dest_node, num_bps=2,
         Number of Bell pairs to request (default: 2)
     config_file : str, optional
         Path to network configuration YAML file (default: "./demo_metrics/config.yml")
+    seed : int, optional
+        Seed for NetSquid's random state, for a reproducible run. The
+        random state is left as it is if not given.
         
     Returns
     -------
@@ -61,9 +109,13 @@ def run_single_simulation(source_node, dest_node, num_bps=2,
     - Normal: alpha = [0.03, 0.1, 0.3] - more permissive, better performance
     - Degraded: alpha = [0.1, 0.3, 0.5] - stricter cutoffs, simulates link failures
     """
-    # Reset for this simulation
-    ns.set_qstate_formalism(ns.DM_FORMALISM)
+    # Reset for this simulation; the formalism normally carries over from
+    # the previous run in this process, so only switch it when needed
+    if ns.get_qstate_formalism() != ns.DM_FORMALISM:
+        ns.set_qstate_formalism(ns.DM_FORMALISM)
     ns.simutil.sim_reset()
+    if seed is not None:
+        ns.set_random_state(seed)
     
     # Create fresh metrics collector and qubit store for this simulation
     qubit_store = {}
@@ -72,18 +124,17 @@ def run_single_simulation(source_node, dest_node, num_bps=2,
     
     # Configuration files
     netconf_file = config_file
-    fidelity_file = "./demo_metrics/fidelities.json"
+    fidelity_file = FIDELITY_FILE
     
     # Calculate fidelity map if not already present
-    if not os.path.exists(fidelity_file):
-        calculate_fidelity_map(netconf_file, fidelity_file)
+    prepare_fidelity_map(netconf_file, fidelity_file)
     
     alpha_values = [0.03, 0.1, 0.3]  # Baseline: normal operation
         
     # Create and start the quantum network
     net = Network(NetworkParams(
         config_path=netconf_file,
-        fidelity_map=load_fidelity_map(fidelity_file),
+        fidelity_map=get_fidelity_map(fidelity_file),
         alpha=alpha_values,
         magic=True,  # Enable magic (improved entanglement generation)
     ))
@@ -9,18 +9,17 @@ if not os.path.exists(paper_repo_path):
     print("Please update the path in main.py to point to your Paper Repo installation")
     sys.exit(1)
 
-sys.path.insert(0, paper_repo_path)
+if paper_repo_path not in sys.path:
+    sys.path.insert(0, paper_repo_path)
 
-# Add current directory to path for local imports
-current_dir = os.path.dirname(os.path.abspath(__file__))
-sys.path.insert(0, current_dir)
-
-print(f"Python path configured:")
-print(f"  Paper Repo: {paper_repo_path}")
-print(f"  Current: {current_dir}")
+# The directory of this script is already on sys.path when it is run as
+# ``python main.py``, so local packages import without further setup
 
 # Import AFTER setting paths
 from demo_metrics.demo_main import main
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    # Only report the configuration for the CLI run, not in spawned workers
+    print(f"Python path configured:")
+    print(f"  Paper Repo: {paper_repo_path}")
+    main()
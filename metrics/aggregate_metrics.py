@@ -4,16 +4,39 @@ Combines all performance metrics into a comprehensive analysis.
 """
 
 import numpy as np
-from typing import List, Dict, Optional
+from collections.abc import Mapping
+from itertools import chain
+from operator import itemgetter
+from typing import List, Dict, Optional, Union
 
-from .throughput import throughput
-from .e2e_fidelity import end_to_end_fidelity
-from .latency import request_latency, unit_latency, scaled_latency
-from .fairness import fairness
+from .throughput import throughput, throughput_array
+from .latency import unit_latency_vec, scaled_latency_vec
+
+_get_times = itemgetter('request_time', 'completion_time')
+
+# Sums over all nodes needed by aggregate_node_totals
+_OVERALL_KEYS = (
+    'requests',
+    'latency_sum',
+    'unit_latency_sum',
+    'scaled_latency_sum',
+    'fidelity_sum',
+    'num_fidelities',
+)
+
+# Metrics reported when no request has completed
+_EMPTY_METRICS = {
+    'throughput': 0.0,
+    'mean_request_latency': 0.0,
+    'mean_unit_latency': 0.0,
+    'mean_scaled_latency': 0.0,
+    'fairness_throughput': 1.0,
+    'fairness_latency': 1.0,
+}
 
 
 def aggregate_metrics(
-    requests: List[Dict],
+    requests: Union[List[Dict], np.ndarray],
     simulation_time: float,
     fidelity_values: Optional[List[float]] = None,
     rejected_states: int = 0
@@ -32,6 +55,9 @@ def aggregate_metrics(
         - 'num_units': number of entanglement units requested
         - 'delivered_state': (optional) delivered quantum state
         - 'node_id': identifier of requesting node
+        or a structured array with fields 'request_time', 'completion_time',
+        'num_units', 'node_id' and 'num_states' (number of fidelity values
+        belonging to the request), as kept by MetricsCollector.
     simulation_time : float
         Total simulation time in nanoseconds
     fidelity_values : List[float], optional
@@ -43,123 +69,224 @@ def aggregate_metrics(
     -------
     Dict[str, float]
         Dictionary containing calculated metrics:
-        - 'throughput': overall throughput (states/ns, multiply by 1e9 for states/s)
+        - 'throughput': throughput of the last node (in order of first
+          appearance) over its active time window (states/s)
+        - 'total_units': units delivered to that node
+        - 'avg_fidelity': (if fidelity_values provided) that node's
+          average fidelity
         - 'mean_request_latency': average request latency (ns)
         - 'mean_unit_latency': average unit latency (ns)
         - 'mean_scaled_latency': average scaled latency (ns)
-        - 'fairness_throughput': fairness of throughput distribution
-        - 'fairness_latency': fairness of latency distribution
         - 'mean_fidelity': (if fidelity_values provided) average fidelity
-        - 'fairness_fidelity': (if fidelity_values provided) fairness of fidelity
-        - 'per_node_metrics': per-node breakdown of all metrics
         - 'rejected_states': number of rejected low-fidelity states
-    """
-    if not requests:
-        return {
-            'throughput': 0.0,
-            'mean_request_latency': 0.0,
-            'mean_unit_latency': 0.0,
-            'mean_scaled_latency': 0.0,
-            'fairness_throughput': 1.0,
-            'fairness_latency': 1.0,
-        }
-    
-    # Calculate per-request and per-node metrics
-    latencies = []
-    unit_latencies = []
-    scaled_latencies = []
-    per_node_data = {}  # Store all metrics per node
-    fidelities = []
-    
-    total_units = 0
-    fid_idx = 0  # Index for accessing fidelity_values list
-    
-    for req in requests:
-        req_latency = request_latency(req['completion_time'], req['request_time'])
-        latencies.append(req_latency)
         
-        num_units = req.get('num_units', 1)
-        total_units += num_units
-        
-        unit_lat = unit_latency(req_latency, num_units)
-        unit_latencies.append(unit_lat)
-        
-        scaled_lat = scaled_latency(req_latency, num_units)
-        scaled_latencies.append(scaled_lat)
-        
-        # Track metrics per node
-        node_id = req.get('node_id', 'default')
-        if node_id not in per_node_data:
-            per_node_data[node_id] = {
-                'units': 0,
-                'latencies': [],
-                'fidelities': [],
-                'first_request_time': float('inf'),
-                'last_completion_time': 0
-            }
-        per_node_data[node_id]['units'] += num_units
-        per_node_data[node_id]['latencies'].append(req_latency)
-        
-        # Track time window for this node
-        per_node_data[node_id]['first_request_time'] = min(
-            per_node_data[node_id]['first_request_time'], 
-            req['request_time']
-        )
-        per_node_data[node_id]['last_completion_time'] = max(
-            per_node_data[node_id]['last_completion_time'], 
-            req['completion_time']
-        )
-        
-        # Use pre-calculated fidelity values from qapi.fidelity()
-        # (calculated during simulation when qubits are available)
-        if fidelity_values and 'delivered_state' in req:
-            num_states = len(req.get('delivered_state', []))
-            for i in range(num_states):
-                if fid_idx < len(fidelity_values):
-                    fid = fidelity_values[fid_idx]
-                    fidelities.append(fid)
-                    per_node_data[node_id]['fidelities'].append(fid)
-                    fid_idx += 1
-    
-    # Calculate per-node aggregated metrics
-    per_node_throughputs = []
-    per_node_latencies = []
-    per_node_fidelities = []
-    per_node_metrics = {}
-    
-    node_id = None
-    for node_id, data in per_node_data.items():
-        node_id = node_id
-        # Calculate throughput based on node's active time window
-        node_active_time = data['last_completion_time'] - data['first_request_time']
-        if node_active_time > 0:
-            node_throughput = data['units'] / node_active_time * 1e9  # states per second
-        else:
-            node_throughput = 0.0
-            
-        node_avg_latency = np.mean(data['latencies'])
-        per_node_throughputs.append(node_throughput)
-        per_node_latencies.append(node_avg_latency)
-        
-        per_node_metrics[node_id] = {
-            'throughput': node_throughput,
-            'total_units': data['units'],
-        }
-        
-        if data['fidelities']:
-            node_avg_fidelity = np.mean(data['fidelities'])
-            per_node_fidelities.append(node_avg_fidelity)
-            per_node_metrics[node_id]['avg_fidelity'] = node_avg_fidelity
+        Fairness is not included; demo_main.calculate_combined_metrics
+        computes it across simulations.
+    """
+    if len(requests) == 0:
+        return dict(_EMPTY_METRICS)
+    
+    n = len(requests)
+    
+    if isinstance(requests, np.ndarray):
+        # Structured record array (e.g. MetricsCollector.requests): every
+        # field is already a column
+        request_times = requests['request_time'].astype(np.float64)
+        completion_times = requests['completion_time'].astype(np.float64)
+        num_units = requests['num_units'].astype(np.int64)
+        node_ids = requests['node_id']
+        states_per_request = requests['num_states'].astype(np.intp)
+    else:
+        # Extract request fields into contiguous arrays; both time stamps come
+        # out of each dict in a single C-level itemgetter call and are written
+        # straight into an array of known size, without an interim list
+        times = np.fromiter(
+            chain.from_iterable(map(_get_times, requests)), dtype=np.float64, count=2 * n
+        ).reshape(n, 2)
+        request_times = np.ascontiguousarray(times[:, 0])
+        completion_times = np.ascontiguousarray(times[:, 1])
+        num_units = np.fromiter((req.get('num_units', 1) for req in requests), dtype=np.int64, count=n)
+        node_ids = (req.get('node_id', 'default') for req in requests)
+        states_per_request = None
+    
+    # Calculate per-request metrics
+    latencies = completion_times - request_times
+    unit_latencies = unit_latency_vec(latencies, num_units)
+    scaled_latencies = scaled_latency_vec(latencies, num_units)
+    
+    # Map node ids to indices 0..k-1 in order of first appearance
+    node_index = {}
+    node_of_request = np.fromiter(
+        (node_index.setdefault(node_id, len(node_index)) for node_id in node_ids),
+        dtype=np.intp, count=n
+    )
+    num_nodes = len(node_index)
+    
+    # Group requests by node: a stable sort keeps each node's requests
+    # contiguous, then every per-node reduction is a single reduceat
+    order = np.argsort(node_of_request, kind='stable')
+    starts = np.flatnonzero(np.diff(node_of_request[order], prepend=-1))
+    node_units = np.add.reduceat(num_units[order], starts)
+    # Track time window for each node
+    node_first_request = np.minimum.reduceat(request_times[order], starts)
+    node_last_completion = np.maximum.reduceat(completion_times[order], starts)
+    
+    # Use pre-calculated fidelity values from qapi.fidelity()
+    # (calculated during simulation when qubits are available).
+    # They are assigned in order, num_states (record arrays) or
+    # len(delivered_state) (dicts) values per request.
+    fidelities = np.empty(0)
+    node_fid_sum = np.zeros(num_nodes)
+    node_fid_count = np.zeros(num_nodes, dtype=np.intp)
+    if fidelity_values is not None and len(fidelity_values) > 0:
+        if states_per_request is None:
+            states_per_request = np.fromiter(
+                (len(req['delivered_state']) if 'delivered_state' in req else 0 for req in requests),
+                dtype=np.intp, count=n
+            )
+        node_of_fidelity = np.repeat(node_of_request, states_per_request)[:len(fidelity_values)]
+        fidelities = np.asarray(fidelity_values, dtype=np.float64)[:len(node_of_fidelity)]
+        node_fid_sum = np.bincount(node_of_fidelity, weights=fidelities, minlength=num_nodes)
+        node_fid_count = np.bincount(node_of_fidelity, minlength=num_nodes)
+    
+    # Calculate throughput based on each node's active time window
+    node_throughput = throughput_array(node_units, node_last_completion - node_first_request)
+    
+    # Per-node metrics of the last node (in order of first appearance)
+    last = num_nodes - 1
+    node_metrics = {
+        'throughput': float(node_throughput[last] * 1e9),  # states per second
+        'total_units': int(node_units[last]),
+    }
+    if node_fid_count[last]:
+        node_metrics['avg_fidelity'] = node_fid_sum[last] / node_fid_count[last]
 
     # Aggregate metrics with per-node fairness
     metrics = {
-        'mean_request_latency': np.mean(latencies),
-        'mean_unit_latency': np.mean(unit_latencies),
-        'mean_scaled_latency': np.mean(scaled_latencies),
+        'mean_request_latency': latencies.mean(),
+        'mean_unit_latency': unit_latencies.mean(),
+        'mean_scaled_latency': scaled_latencies.mean(),
         'rejected_states': rejected_states,
-        **per_node_metrics[node_id],
+        **node_metrics,
     }
     
-    if fidelities:
-        metrics['mean_fidelity'] = np.mean(fidelities)
+    if len(fidelities):
+        metrics['mean_fidelity'] = fidelities.mean()
     return metrics
+
+
+def aggregate_node_totals(
+    node_totals: Dict[str, Dict[str, float]],
+    rejected_states: int = 0,
+    overall_totals: Optional[Dict[str, float]] = None
+) -> Dict[str, float]:
+    """Aggregate metrics from running per-node totals.
+    
+    Gives the same metrics as aggregate_metrics, but from sums that are
+    kept up to date while the simulation runs (see MetricsCollector), so
+    the cost is O(#nodes) rather than O(#requests), or O(1) when the
+    overall totals are kept as well.
+    
+    Parameters
+    ----------
+    node_totals : Dict[str, Dict[str, float]]
+        Totals per node id, in order of first completed request, each with:
+        - 'requests': number of completed requests
+        - 'units': number of entanglement units requested
+        - 'latency_sum': sum of request latencies (ns)
+        - 'unit_latency_sum': sum of unit latencies (ns)
+        - 'scaled_latency_sum': sum of scaled latencies (ns)
+        - 'first_request_time': earliest request time (ns)
+        - 'last_completion_time': latest completion time (ns)
+        - 'fidelity_sum': sum of delivered fidelities
+        - 'num_fidelities': number of delivered fidelities
+    rejected_states : int
+        Number of states rejected due to fidelity threshold
+    overall_totals : Dict[str, float], optional
+        The 'requests', 'latency_sum', 'unit_latency_sum',
+        'scaled_latency_sum', 'fidelity_sum' and 'num_fidelities' sums
+        over all nodes. Summed from node_totals if not given.
+        
+    Returns
+    -------
+    Dict[str, float]
+        Dictionary containing calculated metrics, with the same keys as
+        returned by aggregate_metrics
+    """
+    if not node_totals:
+        return dict(_EMPTY_METRICS)
+    
+    if overall_totals is None:
+        overall_totals = dict.fromkeys(_OVERALL_KEYS, 0)
+        for totals in node_totals.values():
+            for key in _OVERALL_KEYS:
+                overall_totals[key] += totals[key]
+    num_requests = overall_totals['requests']
+    num_fidelities = overall_totals['num_fidelities']
+    
+    # Per-node metrics of the last node (in order of first appearance)
+    totals = next(reversed(node_totals.values()))
+    # Calculate throughput based on node's active time window
+    node_active_time = totals['last_completion_time'] - totals['first_request_time']
+    node_metrics = {
+        'throughput': float(throughput(totals['units'], node_active_time) * 1e9),  # states per second
+        'total_units': int(totals['units']),
+    }
+    if totals['num_fidelities']:
+        node_metrics['avg_fidelity'] = totals['fidelity_sum'] / totals['num_fidelities']
+    
+    metrics = {
+        'mean_request_latency': overall_totals['latency_sum'] / num_requests,
+        'mean_unit_latency': overall_totals['unit_latency_sum'] / num_requests,
+        'mean_scaled_latency': overall_totals['scaled_latency_sum'] / num_requests,
+        'rejected_states': rejected_states,
+        **node_metrics,
+    }
+    
+    if num_fidelities:
+        metrics['mean_fidelity'] = overall_totals['fidelity_sum'] / num_fidelities
+    return metrics
+
+
+class LazyPerNodeMetrics(Mapping):
+    """Per-node metrics, computed from node totals only when accessed.
+    
+    Maps node id to a dict with 'throughput' (states/s), 'avg_latency' (ns),
+    'total_units', 'active_time' (ns) and, if fidelities were recorded,
+    'avg_fidelity'. An entry is computed on first access and then kept, so
+    callers that never look at per-node results pay nothing for them.
+    The totals are copied at construction, so later updates to node_totals
+    do not show up in (or break iteration over) an existing mapping.
+    
+    Parameters
+    ----------
+    node_totals : Dict[str, Dict[str, float]]
+        Totals per node id, as taken by aggregate_node_totals
+    """
+    
+    def __init__(self, node_totals: Dict[str, Dict[str, float]]):
+        self._node_totals = {node_id: dict(totals) for node_id, totals in node_totals.items()}
+        self._computed = {}
+        
+    def __getitem__(self, node_id) -> Dict[str, float]:
+        node_metrics = self._computed.get(node_id)
+        if node_metrics is None:
+            totals = self._node_totals[node_id]
+            # Calculate throughput based on node's active time window
+            node_active_time = totals['last_completion_time'] - totals['first_request_time']
+            node_metrics = {
+                'throughput': float(throughput(totals['units'], node_active_time) * 1e9),  # states per second
+                'avg_latency': totals['latency_sum'] / totals['requests'],
+                'total_units': int(totals['units']),
+                'active_time': node_active_time,
+            }
+            if totals['num_fidelities']:
+                node_metrics['avg_fidelity'] = totals['fidelity_sum'] / totals['num_fidelities']
+            self._computed[node_id] = node_metrics
+        return node_metrics
+        
+    def __iter__(self):
+        return iter(self._node_totals)
+        
+    def __len__(self) -> int:
+        return len(self._node_totals)
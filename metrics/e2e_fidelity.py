@@ -7,6 +7,19 @@ independent of the generation mechanism.
 import numpy as np
 
 
+def _psd_sqrt(matrix: np.ndarray) -> np.ndarray:
+    """Square root of a Hermitian positive semidefinite matrix.
+    
+    Eigenvalues at round-off level are set to zero first: their square
+    roots (~1e-8 for ~1e-16) would otherwise leak into the fidelity of
+    low-rank states such as pure ones.
+    """
+    w, v = np.linalg.eigh(matrix)
+    cutoff = w.max() * len(w) * np.finfo(w.dtype).eps
+    w = np.where(w > cutoff, w, 0.0)
+    return (v * np.sqrt(w)) @ v.conj().T
+
+
 def end_to_end_fidelity(delivered_state: np.ndarray, ideal_state: np.ndarray) -> float:
     """Calculate End-to-End Fidelity (Fe2e).
     
@@ -30,12 +43,20 @@ def end_to_end_fidelity(delivered_state: np.ndarray, ideal_state: np.ndarray) ->
     if ideal_state.ndim == 1:
         # Pure state fidelity: F = |<ψ|ρ|ψ>|²
         # This matches NetSquid's qapi.fidelity with squared=True
-        fidelity = np.abs(ideal_state.conj() @ delivered_state @ ideal_state)
+        rho_psi = delivered_state @ ideal_state
+        if np.iscomplexobj(ideal_state):
+            # vdot conjugates its first argument itself, no conj() copy
+            fidelity = np.abs(np.vdot(ideal_state, rho_psi))
+        else:
+            fidelity = np.abs(ideal_state @ rho_psi)
     else:
         # State fidelity between two density matrices (Uhlmann fidelity)
-        sqrt_rho = np.linalg.cholesky(delivered_state)
-        product = sqrt_rho @ ideal_state @ sqrt_rho.conj().T
-        eigenvalues = np.linalg.eigvalsh(product)
-        fidelity = (np.sqrt(np.maximum(eigenvalues, 0)).sum()) ** 2
+        # F = (Σ σ_i(sqrt(ρ) sqrt(σ)))², the squared nuclear norm. Square
+        # roots come from Hermitian eigendecompositions, so rank-deficient
+        # (e.g. pure) states are handled, unlike with a Cholesky factor
+        singular_values = np.linalg.svd(
+            _psd_sqrt(delivered_state) @ _psd_sqrt(ideal_state), compute_uv=False
+        )
+        fidelity = singular_values.sum() ** 2
     
     return float(np.real(fidelity))
@@ -5,10 +5,13 @@ using Jain's fairness index.
 """
 
 import numpy as np
-from typing import List
+from typing import List, Union
 
+# Python sequences up to this length are reduced without NumPy
+_SMALL_INPUT = 32
 
-def fairness(values: List[float]) -> float:
+
+def fairness(values: Union[List[float], np.ndarray]) -> float:
     """Calculate Fairness (J) using Jain's fairness index.
     
     The metric is resource type independent and is defined for several 
@@ -19,8 +22,9 @@ def fairness(values: List[float]) -> float:
     
     Parameters
     ----------
-    values : List[float]
-        List of metric values across different nodes/requests
+    values : List[float] or np.ndarray
+        Metric values across different nodes/requests. float64 arrays
+        are used without copying; short lists are summed in Python.
         
     Returns
     -------
@@ -36,7 +40,24 @@ def fairness(values: List[float]) -> float:
     >>> fairness([100, 0])  # Maximum unfairness
     0.5
     """
-    x = np.array(values, dtype=float)
-    if len(x) == 0:
+    if isinstance(values, np.ndarray) or len(values) > _SMALL_INPUT:
+        x = np.asarray(values, dtype=np.float64)
+        n = x.size
+        total = x.sum()
+        sum_sq = np.dot(x, x)
+    else:
+        # Per-node lists are short; one pass in Python avoids the NumPy
+        # array construction and dispatch that would dominate here
+        n = len(values)
+        total = 0.0
+        sum_sq = 0.0
+        for v in values:
+            total += v
+            sum_sq += v * v
+    
+    if n == 0:
+        return 1.0
+    if sum_sq == 0:
+        # All-zero allocation is treated as perfectly fair
         return 1.0
-    return float((x.sum() ** 2) / (len(x) * (x ** 2).sum()))
+    return float(total * total / (n * sum_sq))
@@ -3,6 +3,8 @@
 Measures time-related performance: request latency, unit latency, and scaled latency.
 """
 
+import numpy as np
+
 
 def request_latency(completion_time: float, request_time: float) -> float:
     """Calculate Request Latency (Lr) / Waiting Time.
@@ -74,3 +76,51 @@ def scaled_latency(request_latency: float, num_units: int) -> float:
     if num_units <= 0:
         return float('inf')
     return request_latency / num_units
+
+
+def unit_latency_vec(total_time: np.ndarray, num_units: np.ndarray) -> np.ndarray:
+    """Calculate Unit Latency (Lu) for many requests at once.
+    
+    Vectorized form of unit_latency. The division is masked instead of
+    branched on, so entries with num_units <= 0 are inf.
+    
+    Parameters
+    ----------
+    total_time : np.ndarray
+        Total time spent generating entanglement units (in nanoseconds)
+    num_units : np.ndarray
+        Number of entanglement units generated
+        
+    Returns
+    -------
+    np.ndarray
+        Unit latency in nanoseconds per entanglement unit
+    """
+    total_time = np.asarray(total_time, dtype=np.float64)
+    num_units = np.asarray(num_units)
+    out = np.full(np.broadcast(total_time, num_units).shape, np.inf)
+    return np.divide(total_time, num_units, out=out, where=num_units > 0)
+
+
+def scaled_latency_vec(request_latency: np.ndarray, num_units: np.ndarray) -> np.ndarray:
+    """Calculate Scaled Latency (Ls) for many requests at once.
+    
+    Vectorized form of scaled_latency. The division is masked instead of
+    branched on, so entries with num_units <= 0 are inf.
+    
+    Parameters
+    ----------
+    request_latency : np.ndarray
+        Total request latency (Lr) in nanoseconds
+    num_units : np.ndarray
+        Number of entanglement units requested
+        
+    Returns
+    -------
+    np.ndarray
+        Scaled latency in nanoseconds per entanglement unit
+    """
+    request_latency = np.asarray(request_latency, dtype=np.float64)
+    num_units = np.asarray(num_units)
+    out = np.full(np.broadcast(request_latency, num_units).shape, np.inf)
+    return np.divide(request_latency, num_units, out=out, where=num_units > 0)
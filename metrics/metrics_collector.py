@@ -1,21 +1,100 @@
 """Metrics collection for quantum network simulations."""
 
+import sys
+import warnings
 import netsquid as ns
 import numpy as np
-from typing import Dict, List, Optional
+from typing import Dict, Optional, Sequence
 
 # Import individual metric modules
-from .throughput import throughput
-from .e2e_fidelity import end_to_end_fidelity
-from .latency import request_latency, unit_latency, scaled_latency
-from .fairness import fairness
-from .robustness import robustness
-from .aggregate_metrics import aggregate_metrics
+from .latency import unit_latency_vec, scaled_latency_vec
+from .robustness import robustness_batch
+from .aggregate_metrics import aggregate_node_totals, LazyPerNodeMetrics
 
-# Use NetSquid's built-in fidelity calculation instead of manual dm extraction
+# Use NetSquid's reduced density matrix instead of manual dm extraction
 # This properly handles the quantum state
 from netsquid.qubits import qubitapi as qapi
 from netsquid.qubits import ketstates
+from netsquid.qubits.kettools import KetRepr
+
+# Record layout of a completed request. node_id stays a Python object so
+# node names of any length (or non-string ids) are kept as given.
+REQUEST_DTYPE = np.dtype([
+    ('request_id', np.int64),
+    ('node_id', object),
+    ('num_units', np.int64),
+    ('request_time', np.float64),
+    ('completion_time', np.float64),
+    ('num_states', np.int64),
+    ('fidelity_sum', np.float64),
+])
+
+# Projectors |b><b| onto the Bell states, stacked along the first axis:
+# b00 = |Φ+⟩, b01 = |Ψ+⟩, b10 = |Φ-⟩, b11 = |Ψ-⟩. Built once at import as
+# one contiguous complex128 block and shared by every delivery, so it is
+# made read-only.
+BELL_OUTER = np.ascontiguousarray(np.stack([
+    np.outer(ket, ket.conj())
+    for ket in (ketstates.b00, ketstates.b01, ketstates.b10, ketstates.b11)
+]), dtype=np.complex128)
+BELL_OUTER.setflags(write=False)
+
+# Row k holds the transpose of |b_k><b_k|, flattened, so that
+# Tr(|b_k><b_k| ρ) for all k is one (4, 16) x (16,) product with ρ.ravel()
+_BELL_OUTER_FLAT = np.ascontiguousarray(BELL_OUTER.transpose(0, 2, 1).reshape(4, 16))
+_BELL_OUTER_FLAT.setflags(write=False)
+
+# Conjugated Bell kets as rows, for <b|ψ> of pure two-qubit states
+BELL_KETS_CONJ = np.ascontiguousarray(np.stack([
+    ket.ravel().conj()
+    for ket in (ketstates.b00, ketstates.b01, ketstates.b10, ketstates.b11)
+]), dtype=np.complex128)
+BELL_KETS_CONJ.setflags(write=False)
+
+# Metrics compared by calculate_robustness: (metric key, robustness key,
+# whether a higher value is better)
+_ROBUSTNESS_METRICS = (
+    ('throughput', 'robustness_throughput', True),
+    ('mean_fidelity', 'robustness_fidelity', True),
+    ('mean_request_latency', 'robustness_mean_request_latency', False),
+    ('mean_unit_latency', 'robustness_mean_unit_latency', False),
+    ('mean_scaled_latency', 'robustness_mean_scaled_latency', False),
+    ('fairness_throughput', 'robustness_fairness_throughput', True),
+    ('fairness_latency', 'robustness_fairness_latency', True),
+    ('fairness_fidelity', 'robustness_fairness_fidelity', True),
+)
+
+
+def bell_fidelities(qubits: Sequence) -> np.ndarray:
+    """Squared fidelities of a qubit pair to the four Bell states.
+    
+    Parameters
+    ----------
+    qubits : Sequence
+        The two entangled qubits
+        
+    Returns
+    -------
+    np.ndarray
+        Fidelities to b00, b01, b10 and b11, as qapi.fidelity with
+        squared=True would give them
+    """
+    qstate = qubits[0].qstate
+    if (len(qubits) == 2 and qubits[1].qstate is qstate and qstate.num_qubits == 2
+            and isinstance(qstate.qrepr, KetRepr)):
+        # Pure pair that owns its whole state: F_k = |<b_k|ψ>|², one mat-vec.
+        # Every Bell state is ± itself under swapping the qubits, so the
+        # qubit order inside the state does not matter.
+        ket = np.ascontiguousarray(qstate.qrepr.ket, dtype=np.complex128)
+        amplitudes = BELL_KETS_CONJ @ ket.ravel()
+        return amplitudes.real ** 2 + amplitudes.imag ** 2
+    
+    # With ρ the reduced state of the pair (as qapi.fidelity uses),
+    # F_k = <b_k|ρ|b_k> = Tr(|b_k><b_k| ρ) for all k at once. ρ is made
+    # C-contiguous complex128 like the projectors, so ravel() is a view
+    # and the product runs on matching dtypes without a strided copy
+    rho = np.ascontiguousarray(qapi.reduced_dm(qubits), dtype=np.complex128)
+    return np.dot(_BELL_OUTER_FLAT, rho.ravel()).real
 
 
 class MetricsCollector:
@@ -28,33 +107,118 @@ class MetricsCollector:
     ----------
     fidelity_threshold : float, optional
         The ideal target state for fidelity calculations (e.g., Bell state)
+    keep_density_matrices : bool, optional
+        Whether to keep the mean delivered density matrix of every request
+        in ``delivered_states``. The metrics only need the fidelities, so
+        this is off by default.
+    dm_dtype : np.dtype, optional
+        Complex dtype of the running density-matrix sums kept with
+        keep_density_matrices. np.complex64 halves their memory traffic at
+        single precision; the reported means are complex128 either way.
+        Default is np.complex128.
+    
+    Raises
+    ------
+    ValueError
+        If dm_dtype is not a complex floating-point dtype
     
     Attributes
     ----------
-    requests : List[Dict]
-        List of completed request records
+    requests : np.ndarray
+        Completed request records, a structured array of REQUEST_DTYPE
+    delivered_states : Dict[int, np.ndarray]
+        Mean delivered density matrix per completed request_id (only filled
+        when keep_density_matrices is set)
     start_time : float
         Simulation start time
     end_time : float
         Simulation end time
     """
     
-    def __init__(self, fidelity_threshold: float = 0.0):
-        self.requests = []
+    def __init__(self, fidelity_threshold: float = 0.0, keep_density_matrices: bool = False,
+                 dm_dtype=np.complex128):
+        self.fidelity_threshold = fidelity_threshold
+        self.keep_density_matrices = keep_density_matrices
+        if not np.issubdtype(dm_dtype, np.complexfloating):
+            raise ValueError(f"dm_dtype must be a complex dtype, got {np.dtype(dm_dtype)}")
+        self.dm_dtype = np.dtype(dm_dtype)
+        # Bound once; the recording methods read the clock on every call
+        self._sim_time = ns.sim_time
+        self.reset()
+        
+    def reset(self):
+        """Clear all collected data so the collector can be reused.
+        
+        The fidelity threshold and keep_density_matrices are kept. Record
+        arrays returned by earlier ``requests`` calls stay valid, as a new
+        buffer is started.
+        """
+        self._completed = np.empty(16, dtype=REQUEST_DTYPE)
+        self._num_completed = 0
+        self.delivered_states = {}
+        self._node_totals = {}  # Running sums per node, see aggregate_node_totals
+        self._num_folded = 0  # Completed records already in _node_totals
+        self._overall_totals = {  # Running sums over all nodes
+            'requests': 0,
+            'latency_sum': 0.0,
+            'unit_latency_sum': 0.0,
+            'scaled_latency_sum': 0.0,
+            'fidelity_sum': 0.0,
+            'num_fidelities': 0,
+        }
         self.start_time = 0.0
         self.end_time = 0.0
-        self.fidelity_threshold = fidelity_threshold
-        self._active_requests = {}  # Track requests by create_id
+        # Active requests are kept column-wise: request_id maps to a slot
+        # index into the per-field lists below, and slots of finalized
+        # requests are reused through the free list
+        self._active_slots = {}
+        self._free_slots = []
+        self._active_request_id = []
+        self._active_node_id = []
+        self._active_num_units = []
+        self._active_request_time = []
+        self._active_completed_units = []
+        self._active_num_states = []
+        self._active_fidelity_sum = []
+        self._active_dm_sum = []  # Running sum of delivered density matrices
         self.rejected_states = 0  # Track rejected low-fidelity states
-        self.fidelity_values = []  # Store actual fidelity values from qapi.fidelity
+        self._fid_errors = 0  # Deliveries whose state could not be read
+        # Actual fidelity values of accepted states, see fidelity_values
+        self._fidelity_buffer = np.empty(1024, dtype=np.float64)
+        self._num_fidelities = 0
+        # Result of the last calculate_metrics call and the collector
+        # state it was computed from
+        self._metrics_cache = None
+        self._metrics_cache_key = None
+        
+    @property
+    def requests(self) -> np.ndarray:
+        """Completed request records (a view, in completion order)."""
+        return self._completed[:self._num_completed]
+        
+    @property
+    def fidelity_values(self) -> np.ndarray:
+        """Fidelities of all accepted states, in delivery order (a view)."""
+        return self._fidelity_buffer[:self._num_fidelities]
+        
+    @property
+    def per_node_metrics(self) -> LazyPerNodeMetrics:
+        """Per-node throughput, latency and fidelity, built on access.
+        
+        Entries are computed from the running totals the first time they
+        are read; take a fresh mapping after recording further requests.
+        """
+        self._flush()
+        return LazyPerNodeMetrics(self._node_totals)
         
     def start_simulation(self):
         """Mark the start of the simulation."""
-        self.start_time = ns.sim_time()
+        self.start_time = self._sim_time()
         
     def end_simulation(self):
         """Mark the end of the simulation."""
-        self.end_time = ns.sim_time()
+        self.end_time = self._sim_time()
+        self._flush()
         
     def record_request(self, request_id: int, num_units: int, node_id: str = 'default'):
         """Record a new request.
@@ -68,18 +232,42 @@ class MetricsCollector:
         node_id : str
             Identifier of the requesting node
         """
-        self._active_requests[request_id] = {
-            'request_id': request_id,
-            'num_units': num_units,
-            'node_id': node_id,
-            'request_time': ns.sim_time(),
-            'completion_time': None,
-            'delivered_states': [],
-            'completed_units': 0,
-        }
+        slot = self._active_slots.get(request_id)
+        if slot is None:
+            if self._free_slots:
+                slot = self._free_slots.pop()
+            else:
+                slot = len(self._active_request_id)
+                for column in self._active_columns():
+                    column.append(None)
+            self._active_slots[request_id] = slot
+            
+        self._active_request_id[slot] = request_id
+        # Interned so that equal node names share one object and hash
+        # lookups in _flush mostly reduce to an identity check
+        self._active_node_id[slot] = sys.intern(node_id) if type(node_id) is str else node_id
+        self._active_num_units[slot] = num_units
+        self._active_request_time[slot] = self._sim_time()
+        self._active_completed_units[slot] = 0
+        self._active_num_states[slot] = 0
+        self._active_fidelity_sum[slot] = 0.0
+        self._active_dm_sum[slot] = None
+        
+    def _active_columns(self):
+        """All per-field lists of the active request table."""
+        return (
+            self._active_request_id,
+            self._active_node_id,
+            self._active_num_units,
+            self._active_request_time,
+            self._active_completed_units,
+            self._active_num_states,
+            self._active_fidelity_sum,
+            self._active_dm_sum,
+        )
         
     def record_delivery(self, request_id: int, qubit_id: int, 
-                       qubits: Optional[List] = None):
+                       qubits: Optional[Sequence] = None):
         """Record a successful delivery of an entanglement unit.
         
         Parameters
@@ -88,77 +276,252 @@ class MetricsCollector:
             Unique identifier for the request
         qubit_id : int
             Logical qubit identifier
-        qubits : List, optional
-            The entangled qubits (for fidelity calculation)
+        qubits : Sequence, optional
+            The entangled qubits (for fidelity calculation), e.g. a list or tuple
         """
-        if request_id not in self._active_requests:
+        slot = self._active_slots.get(request_id)
+        if slot is None:
             return
             
-        req = self._active_requests[request_id]
-        req['completed_units'] += 1
+        self._active_completed_units[slot] += 1
         
         # Store quantum state if provided
         if qubits is not None and len(qubits) > 0:
             try:
                 # Calculate fidelity to all 4 Bell states and use the maximum
-                # b00 = |Φ+⟩, b01 = |Ψ+⟩, b10 = |Φ-⟩, b11 = |Ψ-⟩
-                fid_phi_plus = qapi.fidelity(qubits, ketstates.b00, squared=True)
-                fid_psi_plus = qapi.fidelity(qubits, ketstates.b01, squared=True)
-                fid_phi_minus = qapi.fidelity(qubits, ketstates.b10, squared=True)
-                fid_psi_minus = qapi.fidelity(qubits, ketstates.b11, squared=True)
+                fids = bell_fidelities(qubits)
                 
                 # Use the maximum fidelity (closest to any Bell state)
-                max_fid = max(fid_phi_plus, fid_psi_plus, fid_phi_minus, fid_psi_minus)
+                max_fid = float(fids.max())
                 
-                # Check fidelity threshold
-                if self.fidelity_threshold > 0 and max_fid < self.fidelity_threshold:
+                # Check fidelity threshold. The four Bell fidelities sum to
+                # Tr(ρ) = 1, so max_fid >= 0.25 and a threshold <= 0 (the
+                # default 0.0 disables filtering) never rejects; no separate
+                # "threshold enabled" test is needed
+                if max_fid < self.fidelity_threshold:
                     self.rejected_states += 1
                     # Don't count this as a completed unit - decrement
-                    req['completed_units'] -= 1
+                    self._active_completed_units[slot] -= 1
                     return  # Reject this state
                 
-                # Store the actual fidelity value for reporting
-                self.fidelity_values.append(max_fid)
+                # Accumulate the density matrix for other potential uses
+                if self.keep_density_matrices:
+                    self._accumulate_dm(slot, qubits[0].qstate.dm)
                 
-                # Store the density matrix for other potential uses
-                dm = qubits[0].qstate.dm
-                req['delivered_states'].append(dm)
+                # Store the actual fidelity value for reporting
+                self._append_fidelities(max_fid)
+                self._active_fidelity_sum[slot] += max_fid
+                self._active_num_states[slot] += 1
             except Exception as e:
-                print(f"Warning: Could not get quantum state: {e}")
-                pass  # Skip if we can't get the state
+                # Skip if we can't get the state; warn only once per run
+                # rather than writing to stdout on every failed delivery
+                self._fid_errors += 1
+                if self._fid_errors == 1:
+                    warnings.warn(f"Could not get quantum state: {e} "
+                                  f"(suppressing further warnings)", RuntimeWarning)
         
         # Check if request is complete
-        if req['completed_units'] >= req['num_units']:
-            req['completion_time'] = ns.sim_time()
-            self._finalize_request(request_id)
+        if self._active_completed_units[slot] >= self._active_num_units[slot]:
+            self._finalize_request(request_id, self._sim_time())
             
-    def _finalize_request(self, request_id: int):
-        """Move a completed request to the completed list.
+    def record_delivery_batch(self, request_id: int, qubit_ids: Sequence[int],
+                              qubits_list: Sequence[Sequence]):
+        """Record several deliveries for one request at once.
+        
+        Equivalent to calling record_delivery for each (qubit_id, qubits)
+        pair in order, but the Bell fidelities of all pairs come from a
+        single matrix product over their stacked reduced density matrices.
         
         Parameters
         ----------
         request_id : int
             Unique identifier for the request
+        qubit_ids : Sequence[int]
+            Logical qubit identifiers, one per delivery
+        qubits_list : Sequence[Sequence]
+            The entangled qubits of each delivery
         """
-        if request_id not in self._active_requests:
+        slot = self._active_slots.get(request_id)
+        if slot is None or len(qubits_list) == 0:
+            return
+        
+        try:
+            rhos = np.stack([
+                np.asarray(qapi.reduced_dm(qubits), dtype=np.complex128).reshape(16)
+                for qubits in qubits_list
+            ])
+        except Exception:
+            # Some state can't be read; go one delivery at a time so the
+            # others are still counted as record_delivery would
+            for qubit_id, qubits in zip(qubit_ids, qubits_list):
+                self.record_delivery(request_id, qubit_id, qubits)
             return
+        
+        # Max fidelity to the four Bell states for every pair, see
+        # bell_fidelities
+        fids = (rhos @ _BELL_OUTER_FLAT.T).real.max(axis=1)
+        accepted = ~(fids < self.fidelity_threshold)
+        
+        # Deliveries after the one that completes the request are ignored,
+        # as they would be by separate record_delivery calls
+        remaining = self._active_num_units[slot] - self._active_completed_units[slot]
+        completing = np.searchsorted(np.cumsum(accepted), max(remaining, 1))
+        if completing < len(fids):
+            fids = fids[:completing + 1]
+            accepted = accepted[:completing + 1]
+        num_accepted = int(np.count_nonzero(accepted))
+        self.rejected_states += len(fids) - num_accepted
+        
+        if self.keep_density_matrices:
+            for i in np.flatnonzero(accepted):
+                self._accumulate_dm(slot, qubits_list[i][0].qstate.dm)
+        
+        fids = fids[accepted]
+        self._append_fidelities(fids)
+        self._active_fidelity_sum[slot] += fids.sum().item()
+        self._active_num_states[slot] += num_accepted
+        self._active_completed_units[slot] += num_accepted
+        
+        # Check if request is complete
+        if num_accepted and self._active_completed_units[slot] >= self._active_num_units[slot]:
+            self._finalize_request(request_id, self._sim_time())
+            
+    def _accumulate_dm(self, slot: int, dm: np.ndarray):
+        """Add a delivered density matrix to the running sum of a slot.
+        
+        Only the running sum is kept, not every matrix.
+        """
+        dm_sum = self._active_dm_sum[slot]
+        if dm_sum is None:
+            self._active_dm_sum[slot] = np.array(dm, dtype=self.dm_dtype)
+        else:
+            np.add(dm_sum, dm, out=dm_sum)
             
-        req = self._active_requests[request_id]
+    def _append_fidelities(self, values):
+        """Append accepted fidelities (a float or an array) to the buffer.
+        
+        The buffer capacity is doubled until the values fit.
+        """
+        start = self._num_fidelities
+        end = start + np.size(values)
+        if end > len(self._fidelity_buffer):
+            capacity = 2 * len(self._fidelity_buffer)
+            while capacity < end:
+                capacity *= 2
+            grown = np.empty(capacity, dtype=np.float64)
+            grown[:start] = self._fidelity_buffer[:start]
+            self._fidelity_buffer = grown
+        self._fidelity_buffer[start:end] = values
+        self._num_fidelities = end
+        
+    def _finalize_request(self, request_id: int, completion_time: float):
+        """Move a completed request to the completed records.
+        
+        Parameters
+        ----------
+        request_id : int
+            Unique identifier for the request
+        completion_time : float
+            Time when the request was completed
+        """
+        slot = self._active_slots.pop(request_id, None)
+        if slot is None:
+            return
+        self._free_slots.append(slot)
+        
+        num_states = self._active_num_states[slot]
+        dm_sum = self._active_dm_sum[slot]
+        self._active_dm_sum[slot] = None
         
         # Calculate average delivered state if multiple units
-        if req['delivered_states']:
-            req['delivered_state'] = np.mean(req['delivered_states'], axis=0)
+        if dm_sum is not None:
+            self.delivered_states[request_id] = np.divide(dm_sum, num_states, dtype=np.complex128)
         
-        # Remove temporary data
-        del req['delivered_states']
+        # Double the record capacity when full
+        if self._num_completed == len(self._completed):
+            grown = np.empty(2 * len(self._completed), dtype=REQUEST_DTYPE)
+            grown[:self._num_completed] = self._completed
+            self._completed = grown
         
         # Move to completed
-        self.requests.append(req)
-        del self._active_requests[request_id]
+        self._completed[self._num_completed] = (
+            self._active_request_id[slot],
+            self._active_node_id[slot],
+            self._active_num_units[slot],
+            self._active_request_time[slot],
+            completion_time,
+            num_states,
+            self._active_fidelity_sum[slot],
+        )
+        self._num_completed += 1
+        
+    def _flush(self):
+        """Fold completed records not yet counted into the per-node totals.
+        
+        Completions are only appended to the record array while the
+        simulation runs; their latencies and per-node sums are computed
+        here for the whole pending batch at once.
+        """
+        pending = self._completed[self._num_folded:self._num_completed]
+        if len(pending) == 0:
+            return
+        
+        num_units = pending['num_units']
+        latencies = pending['completion_time'] - pending['request_time']
+        unit_latencies = unit_latency_vec(latencies, num_units)
+        scaled_latencies = scaled_latency_vec(latencies, num_units)
+        
+        # Map node ids to indices in order of first appearance and group
+        # the batch by node
+        node_index = {}
+        node_of_request = np.fromiter(
+            (node_index.setdefault(node_id, len(node_index)) for node_id in pending['node_id']),
+            dtype=np.intp, count=len(pending)
+        )
+        order = np.argsort(node_of_request, kind='stable')
+        starts = np.flatnonzero(np.diff(node_of_request[order], prepend=-1))
+        sums = {
+            'requests': np.diff(starts, append=len(pending)),
+            'units': np.add.reduceat(num_units[order], starts),
+            'latency_sum': np.add.reduceat(latencies[order], starts),
+            'unit_latency_sum': np.add.reduceat(unit_latencies[order], starts),
+            'scaled_latency_sum': np.add.reduceat(scaled_latencies[order], starts),
+            'fidelity_sum': np.add.reduceat(pending['fidelity_sum'][order], starts),
+            'num_fidelities': np.add.reduceat(pending['num_states'][order], starts),
+        }
+        first_request = np.minimum.reduceat(pending['request_time'][order], starts)
+        last_completion = np.maximum.reduceat(pending['completion_time'][order], starts)
+        
+        for node_id, i in node_index.items():
+            totals = self._node_totals.get(node_id)
+            if totals is None:
+                totals = self._node_totals[node_id] = {
+                    'requests': 0,
+                    'units': 0,
+                    'latency_sum': 0.0,
+                    'unit_latency_sum': 0.0,
+                    'scaled_latency_sum': 0.0,
+                    'first_request_time': float('inf'),
+                    'last_completion_time': 0.0,
+                    'fidelity_sum': 0.0,
+                    'num_fidelities': 0,
+                }
+            for key, values in sums.items():
+                totals[key] += values[i].item()
+            totals['first_request_time'] = min(totals['first_request_time'], first_request[i].item())
+            totals['last_completion_time'] = max(totals['last_completion_time'], last_completion[i].item())
+        for key in self._overall_totals:
+            self._overall_totals[key] += sums[key].sum().item()
+        
+        self._num_folded = self._num_completed
         
     def calculate_metrics(self) -> Dict[str, float]:
         """Calculate all metrics from collected data.
         
+        The result is cached until another request completes, a state is
+        rejected or the simulation times change, so print_metrics and
+        calculate_robustness can both call this without aggregating twice.
+        
         Returns
         -------
         Dict[str, float]
@@ -166,15 +529,18 @@ class MetricsCollector:
         """
         if self.end_time == 0:
             self.end_simulation()
+        
+        key = (self._num_completed, self.rejected_states, self.start_time, self.end_time)
+        if key == self._metrics_cache_key:
+            return dict(self._metrics_cache)
             
         simulation_time = self.end_time - self.start_time
         
-        # Use aggregate function for most metrics, passing actual fidelity values
-        metrics = aggregate_metrics(
-            self.requests, 
-            simulation_time,
-            fidelity_values=self.fidelity_values,
-            rejected_states=self.rejected_states
+        # Metrics come from the per-node running totals, so this does not
+        # revisit every completed request
+        self._flush()
+        metrics = aggregate_node_totals(
+            self._node_totals, self.rejected_states, self._overall_totals
         )
         
         # Add timing info
@@ -183,7 +549,9 @@ class MetricsCollector:
         metrics['end_time'] = self.end_time
         metrics['total_requests'] = len(self.requests)
         
-        return metrics
+        self._metrics_cache = metrics
+        self._metrics_cache_key = key
+        return dict(metrics)
         
     def calculate_robustness(self, baseline_metrics: Dict[str, float]) -> Dict[str, float]:
         """Calculate robustness metrics compared to baseline.
@@ -199,42 +567,22 @@ class MetricsCollector:
             Robustness values for each metric
         """
         current_metrics = self.calculate_metrics()
-        robustness_metrics = {}
-        
-        # Throughput robustness
-        if 'throughput' in baseline_metrics and 'throughput' in current_metrics:
-            robustness_metrics['robustness_throughput'] = robustness(
-                baseline_metrics['throughput'],
-                current_metrics['throughput'],
-                'throughput'
-            )
-            
-        # Fidelity robustness
-        if 'mean_fidelity' in baseline_metrics and 'mean_fidelity' in current_metrics:
-            robustness_metrics['robustness_fidelity'] = robustness(
-                baseline_metrics['mean_fidelity'],
-                current_metrics['mean_fidelity'],
-                'fidelity'
-            )
-            
-        # Latency robustness
-        for lat_type in ['mean_request_latency', 'mean_unit_latency', 'mean_scaled_latency']:
-            if lat_type in baseline_metrics and lat_type in current_metrics:
-                robustness_metrics[f'robustness_{lat_type}'] = robustness(
-                    baseline_metrics[lat_type],
-                    current_metrics[lat_type],
-                    'latency'
-                )
-                
-        # Fairness robustness
-        for fair_type in ['fairness_throughput', 'fairness_latency', 'fairness_fidelity']:
-            if fair_type in baseline_metrics and fair_type in current_metrics:
-                robustness_metrics[f'robustness_{fair_type}'] = robustness(
-                    baseline_metrics[fair_type],
-                    current_metrics[fair_type],
-                    'fairness'
-                )
-                
+        
+        # Pack the metrics present in both runs and evaluate them at once
+        names = []
+        baseline = []
+        degraded = []
+        higher_is_better = []
+        for key, name, higher in _ROBUSTNESS_METRICS:
+            if key in baseline_metrics and key in current_metrics:
+                names.append(name)
+                baseline.append(baseline_metrics[key])
+                degraded.append(current_metrics[key])
+                higher_is_better.append(higher)
+        
+        values = robustness_batch(baseline, degraded, higher_is_better)
+        robustness_metrics = dict(zip(names, values.tolist()))
+        
         return robustness_metrics
         
     def print_metrics(self):
@@ -251,6 +599,8 @@ class MetricsCollector:
         if self.fidelity_threshold > 0:
             print(f"  Fidelity threshold: {self.fidelity_threshold:.2f}")
             print(f"  Rejected low-fidelity states: {self.rejected_states}")
+        if self._fid_errors:
+            print(f"  Deliveries without readable state: {self._fid_errors}")
         
         print(f"\nThroughput (T):")
         throughput_val = metrics.get('throughput', 0)
@@ -273,9 +623,10 @@ class MetricsCollector:
             print(f"  J_fidelity (per-node): {metrics.get('fairness_fidelity', 0):.6f}")
         
         # Show per-node breakdown
-        if 'per_node_metrics' in metrics:
+        per_node_metrics = self.per_node_metrics
+        if per_node_metrics:
             print(f"\nPer-Node Breakdown:")
-            for node_id, node_metrics in metrics['per_node_metrics'].items():
+            for node_id, node_metrics in per_node_metrics.items():
                 print(f"  {node_id}:")
                 print(f"    Throughput: {node_metrics['throughput']:.6f} states/s")
                 print(f"    Avg Latency: {node_metrics['avg_latency']/1e6:.2f} ms")
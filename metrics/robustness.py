@@ -3,6 +3,11 @@
 The sensitivity of performance metrics to network failures.
 """
 
+import numpy as np
+
+# Metric types where a higher value is better
+_HIGHER_IS_BETTER = frozenset(('throughput', 'fidelity', 'fairness'))
+
 
 def robustness(
     metric_baseline: float,
@@ -46,7 +51,7 @@ def robustness(
     >>> robustness(10, 15, 'latency')  # 50% latency increase
     0.667
     """
-    if metric_type in ['throughput', 'fidelity', 'fairness']:
+    if metric_type in _HIGHER_IS_BETTER:
         # Higher is better: robustness = degraded / baseline
         if metric_baseline <= 0:
             return 0.0
@@ -59,3 +64,42 @@ def robustness(
     else:
         raise ValueError(f"Unknown metric_type: {metric_type}. "
                         f"Must be 'throughput', 'fidelity', 'fairness', or 'latency'")
+
+
+def robustness_batch(
+    metric_baseline: np.ndarray,
+    metric_degraded: np.ndarray,
+    higher_is_better: np.ndarray
+) -> np.ndarray:
+    """Calculate Robustness (RM) for several metrics at once.
+    
+    Element-wise version of robustness, with the metric type given as a
+    boolean mask instead of a string.
+    
+    Parameters
+    ----------
+    metric_baseline : np.ndarray
+        Metric values under normal operation (no failures)
+    metric_degraded : np.ndarray
+        Metric values under failure conditions
+    higher_is_better : np.ndarray
+        True for throughput/fidelity/fairness metrics, False for latency
+        metrics
+        
+    Returns
+    -------
+    np.ndarray
+        Robustness ratios, degraded / baseline where higher is better
+        (0.0 if baseline <= 0) and baseline / degraded otherwise
+        (inf if degraded <= 0)
+    """
+    metric_baseline = np.asarray(metric_baseline, dtype=np.float64)
+    metric_degraded = np.asarray(metric_degraded, dtype=np.float64)
+    higher_is_better = np.asarray(higher_is_better, dtype=bool)
+    
+    result = np.where(higher_is_better, 0.0, np.inf)
+    np.divide(metric_degraded, metric_baseline, out=result,
+              where=higher_is_better & ~(metric_baseline <= 0))
+    np.divide(metric_baseline, metric_degraded, out=result,
+              where=~higher_is_better & ~(metric_degraded <= 0))
+    return result
@@ -4,6 +4,8 @@ The average rate at which usable entanglement resources are delivered
 to the application layer.
 """
 
+import numpy as np
+
 
 def throughput(num_entangled_states: int, total_time: float) -> float:
     """Calculate Entanglement Generation Rate / Throughput (T).
@@ -24,3 +26,28 @@ def throughput(num_entangled_states: int, total_time: float) -> float:
     if total_time <= 0:
         return 0.0
     return num_entangled_states / total_time
+
+
+def throughput_array(num_entangled_states: np.ndarray, total_time: np.ndarray) -> np.ndarray:
+    """Calculate throughput element-wise, e.g. for every node at once.
+    
+    Parameters
+    ----------
+    num_entangled_states : np.ndarray
+        Number of entangled states delivered
+    total_time : np.ndarray
+        Time periods over which the states were delivered (in nanoseconds)
+        
+    Returns
+    -------
+    np.ndarray
+        Throughput in entangled states per nanosecond, 0.0 where
+        total_time <= 0
+    """
+    num_entangled_states, total_time = np.broadcast_arrays(
+        np.asarray(num_entangled_states, dtype=np.float64),
+        np.asarray(total_time, dtype=np.float64)
+    )
+    out = np.zeros(num_entangled_states.shape)
+    np.divide(num_entangled_states, total_time, out=out, where=total_time > 0)
+    return out